@@ -1,38 +1,59 @@
 import dash
 from dash import dcc, html, Input, Output, State
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.colors import qualitative, sequential
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 import os
+import time
+import atexit
+import shutil
+import tempfile
 import base64
 import io
 import json
+import functools
+import secrets
+import hashlib
+import hmac
 import pickle
+import threading
+import concurrent.futures
+from flask import session
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 
-# Add this at the beginning of the file, right after the imports
+# Copy-on-write: frames and arrays derived from df share its memory read-only, and a
+# callback that modifies one gets its own copy instead of writing into df
+pd.set_option('mode.copy_on_write', True)
+
 # Enable more detailed error messages
-import sys
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
+
+# What a decorated callback returns when it raises; callables are invoked so each error gets a fresh object
+ERROR_FALLBACKS = {
+    'update_time_series': go.Figure,
+    'update_request_type_pie': go.Figure,
+    'update_country_bar_chart': go.Figure,
+    'update_age_group_chart': go.Figure,
+    'update_statistics_table': lambda: html.Div("Error loading statistics. Please check the console for details.")
+}
 
 def handle_error(func):
+    # Resolved once at decoration time rather than on every call
+    fallback = ERROR_FALLBACKS.get(func.__name__, dash.no_update)
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except Exception as e:
-            print(f"Error in {func.__name__}: {e}")
-            traceback.print_exc(file=sys.stdout)
-            if func.__name__ in ['update_metrics']:
-                return "0", "0", "0", "0"
-            elif func.__name__ in ['update_time_series', 'update_request_type_pie', 'update_country_bar_chart', 'update_age_group_chart']:
-                # Return an empty figure
-                return go.Figure()
-            elif func.__name__ == 'update_statistics_table':
-                return html.Div("Error loading statistics. Please check the console for details.")
-            else:
-                return dash.no_update
+        except Exception:
+            logger.exception("Error in %s", func.__name__)
+            return fallback() if callable(fallback) else fallback
     return wrapper
 
 # Initialize the Dash app
@@ -50,35 +71,89 @@ login_manager.login_view = '/login'
 
 # User class for authentication
 class User(UserMixin):
-    def __init__(self, id, username, password, email=None):
+    def __init__(self, id, username, email=None):
         self.id = id
         self.username = username
-        self.password = password
         self.email = email
 
 # User database - now we'll use a file to persist users
-USER_DB_FILE = 'users.pickle'
+USER_DB_FILE = 'users.json'
+
+# Pickled user database of older versions, with plaintext passwords. Moved into
+# USER_DB_FILE once and then renamed, see migrate_legacy_users.
+LEGACY_USER_DB_FILE = 'users.pickle'
+
+# Salted scrypt digest of a password, as hex strings so it can be stored in the JSON file
+def hash_password(password, salt=None):
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1, dklen=32)
+    return salt.hex(), digest.hex()
+
+# Check a password against a stored user record in constant time
+def check_password(user_data, password):
+    if not password or 'password_hash' not in user_data:
+        return False
+    _, digest = hash_password(password, bytes.fromhex(user_data['salt']))
+    return hmac.compare_digest(bytes.fromhex(digest), bytes.fromhex(user_data['password_hash']))
+
+# Build a user record; only the salt and digest of the password are kept
+def make_user(username, password, email):
+    salt, password_hash = hash_password(password)
+    return {'id': username, 'username': username, 'salt': salt, 'password_hash': password_hash, 'email': email}
+
+# Replace the plaintext passwords of older records by their salt and digest. Returns
+# whether any record changed.
+def hash_plaintext_passwords(users):
+    changed = False
+    for user_data in users.values():
+        if 'password' in user_data:
+            user_data['salt'], user_data['password_hash'] = hash_password(user_data.pop('password'))
+            changed = True
+    return changed
+
+# Move the accounts of the legacy pickle file into USER_DB_FILE, with hashed passwords,
+# and rename the pickle so this only happens once. The pickle is the app's own file from
+# before the switch to JSON.
+def migrate_legacy_users():
+    try:
+        with open(LEGACY_USER_DB_FILE, 'rb') as f:
+            users = pickle.load(f)
+        hash_plaintext_passwords(users)
+        if save_users(users):
+            os.replace(LEGACY_USER_DB_FILE, LEGACY_USER_DB_FILE + '.migrated')
+            print(f"Migrated {len(users)} users from {LEGACY_USER_DB_FILE} to {USER_DB_FILE}")
+    except Exception as e:
+        print(f"Error migrating users from {LEGACY_USER_DB_FILE}: {e}")
 
 # Function to load users from file
 def load_users():
+    if not os.path.exists(USER_DB_FILE) and os.path.exists(LEGACY_USER_DB_FILE):
+        migrate_legacy_users()
+    
     if os.path.exists(USER_DB_FILE):
         try:
-            with open(USER_DB_FILE, 'rb') as f:
-                return pickle.load(f)
+            with open(USER_DB_FILE, 'r') as f:
+                users = json.load(f)
+            # Hash plaintext passwords left by older versions of the file, and write the
+            # hashes back so the plaintext doesn't stay on disk
+            if hash_plaintext_passwords(users):
+                save_users(users)
+            return users
         except Exception as e:
             print(f"Error loading users: {e}")
     
     # Default users if file doesn't exist or there's an error
     return {
-        'admin': {'id': 'admin', 'username': 'admin', 'password': 'password123', 'email': 'admin@example.com'},
-        'user': {'id': 'user', 'username': 'user', 'password': 'password124', 'email': 'user@example.com'}
+        'admin': make_user('admin', 'password123', 'admin@example.com'),
+        'user': make_user('user', 'password124', 'user@example.com')
     }
 
 # Function to save users to file
 def save_users(users):
     try:
-        with open(USER_DB_FILE, 'wb') as f:
-            pickle.dump(users, f)
+        with open(USER_DB_FILE, 'w') as f:
+            json.dump(users, f)
         return True
     except Exception as e:
         print(f"Error saving users: {e}")
@@ -87,11 +162,14 @@ def save_users(users):
 # Load users
 USERS = load_users()
 
+# Email -> user id, so registration checks for a taken email without scanning USERS
+EMAIL_INDEX = {user_data['email']: user_id for user_id, user_data in USERS.items() if user_data.get('email')}
+
 @login_manager.user_loader
 def load_user(user_id):
     if user_id in USERS:
         user_data = USERS[user_id]
-        return User(user_data['id'], user_data['username'], user_data['password'], user_data.get('email'))
+        return User(user_data['id'], user_data['username'], user_data.get('email'))
     return None
 
 # Country to continent mapping
@@ -122,46 +200,136 @@ country_to_continent = {
     'Kenya': 'Africa'
 }
 
+# ISO 3166-1 alpha-3 codes of the known countries, so the world map can locate them with
+# locationmode='ISO-3' instead of having plotly match country names
+COUNTRY_ISO3 = {
+    'United States': 'USA',
+    'Canada': 'CAN',
+    'Mexico': 'MEX',
+    'Brazil': 'BRA',
+    'Argentina': 'ARG',
+    'Chile': 'CHL',
+    'Colombia': 'COL',
+    'Peru': 'PER',
+    'United Kingdom': 'GBR',
+    'France': 'FRA',
+    'Germany': 'DEU',
+    'Italy': 'ITA',
+    'Spain': 'ESP',
+    'Russia': 'RUS',
+    'China': 'CHN',
+    'Japan': 'JPN',
+    'India': 'IND',
+    'South Korea': 'KOR',
+    'Australia': 'AUS',
+    'New Zealand': 'NZL',
+    'Egypt': 'EGY',
+    'South Africa': 'ZAF',
+    'Nigeria': 'NGA',
+    'Kenya': 'KEN'
+}
+
+# Chart colors, resolved once instead of on every figure build
+_SET3 = list(qualitative.Set3)
+_VIRIDIS = list(sequential.Viridis)
+_TEAL = list(sequential.Teal)
+
 # Default continent for unknown countries
 default_continent = 'Unknown'
 
+# Log file and the types of its known columns, so read_csv doesn't have to infer them
+DATA_FILE = 'assets/dashboard_web_server_logs.csv'
+
+# Parquet copy of DATA_FILE written on first load; columnar and typed, so later starts skip CSV parsing
+PARQUET_FILE = 'assets/dashboard_web_server_logs.parquet'
+DTYPES = {
+    'country': 'category',
+    'continent': 'category',
+    'age_group': 'category',
+    'request_type': 'category'
+}
+
+# Display order of the age groups; values outside it are kept and sorted after these
+AGE_ORDER = ['18-24', '25-34', '35-44', '45-54', '55-64', '65+']
+
+# Common time column names, checked in order when there is no 'timestamp' column
+TIME_COLUMNS = ['date', 'time', 'datetime', 'Date', 'Time', 'DateTime', 'log_time', 'request_time']
+
+# Read the raw CSV, with the time column parsed and renamed to 'timestamp'
+def read_csv_logs():
+    # Load from assets folder
+    print("Loading dashboard_web_server_logs.csv from assets folder")
+    
+    # Read the header first so the time column can be parsed while loading
+    columns = pd.read_csv(DATA_FILE, nrows=0).columns.tolist()
+    
+    # Print column names for debugging
+    print("Columns in the dataset:", columns)
+    
+    # Check if timestamp column exists, if not try to find a date/time column
+    found_time_col = None
+    if 'timestamp' in columns:
+        found_time_col = 'timestamp'
+    else:
+        print("'timestamp' column not found, looking for alternative time columns")
+        
+        # Look for common time column names
+        for col in TIME_COLUMNS:
+            if col in columns:
+                print(f"Found time column: {col}")
+                found_time_col = col
+                break
+    
+    read_options = {
+        'dtype': DTYPES,
+        'parse_dates': [found_time_col] if found_time_col else False
+    }
+    try:
+        # The pyarrow engine splits the file into blocks and parses them on all cores
+        df = pd.read_csv(DATA_FILE, engine='pyarrow', **read_options)
+    except Exception as e:
+        print(f"Parallel CSV read failed, falling back to the C engine: {e}")
+        df = pd.read_csv(DATA_FILE, engine='c', **read_options)
+    
+    # If a time column is found, rename it to timestamp
+    if found_time_col and found_time_col != 'timestamp':
+        df = df.rename(columns={found_time_col: 'timestamp'})
+    elif not found_time_col:
+        # If no time column is found, creating a synthetic timestamp
+        print("No time column found, creating a synthetic timestamp")
+        df['timestamp'] = pd.date_range(start='2023-01-01', periods=len(df), freq='H')
+    
+    return df
+
 # Load and process the data
 def load_data():
     try:
-        # Load from assets folder
-        print("Loading dashboard_web_server_logs.csv from assets folder")
-        df = pd.read_csv('assets/dashboard_web_server_logs.csv')
+        # Reuse the Parquet copy of the CSV while it is at least as new as the CSV
+        df = None
+        if os.path.exists(PARQUET_FILE) and os.path.getmtime(PARQUET_FILE) >= os.path.getmtime(DATA_FILE):
+            try:
+                print("Loading cached dashboard_web_server_logs.parquet from assets folder")
+                df = pd.read_parquet(PARQUET_FILE, engine='pyarrow')
+            except Exception as e:
+                print(f"Error reading Parquet cache, falling back to CSV: {e}")
         
-        # Print column names for debugging
-        print("Columns in the dataset:", df.columns.tolist())
-        
-        # Check if timestamp column exists, if not try to find a date/time column
-        if 'timestamp' not in df.columns:
-            print("'timestamp' column not found, looking for alternative time columns")
-            
-            # Look for common time column names
-            time_columns = ['date', 'time', 'datetime', 'Date', 'Time', 'DateTime', 'log_time', 'request_time']
-            found_time_col = None
-            
-            for col in time_columns:
-                if col in df.columns:
-                    print(f"Found time column: {col}")
-                    found_time_col = col
-                    break
-            
-            # If a time column is found, rename it to timestamp
-            if found_time_col:
-                df = df.rename(columns={found_time_col: 'timestamp'})
-            else:
-                # If no time column is found, creating a synthetic timestamp
-                print("No time column found, creating a synthetic timestamp")
-                df['timestamp'] = pd.date_range(start='2023-01-01', periods=len(df), freq='H')
+        if df is None:
+            df = read_csv_logs()
+            try:
+                df.to_parquet(PARQUET_FILE, engine='pyarrow', compression='zstd')
+            except Exception as e:
+                print(f"Error writing Parquet cache: {e}")
         
         # Ensure timestamp is datetime type
         if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
             print("Converting timestamp to datetime")
             df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
         
+        # The pyarrow CSV engine parses to seconds and the Parquet cache returns
+        # milliseconds; keep nanoseconds everywhere, as the exports (to_json in particular)
+        # only write correct epochs and a stable format for those
+        df['timestamp'] = df['timestamp'].astype('datetime64[ns]')
+        
         # Process the data - check if date columns already exist
         if 'date' not in df.columns:
             df['date'] = df['timestamp'].dt.date
@@ -169,11 +337,10 @@ def load_data():
         if 'hour' not in df.columns:
             df['hour'] = df['timestamp'].dt.hour
             
-        if 'day' not in df.columns:
-            df['day'] = df['timestamp'].dt.day_name()
-            
-        if 'month' not in df.columns:
-            df['month'] = df['timestamp'].dt.month_name()
+        
+        # Derive continent from country when the log doesn't carry it; map works per category, not per row
+        if 'continent' not in df.columns and 'country' in df.columns:
+            df['continent'] = df['country'].map(country_to_continent).fillna(default_continent)
         
         # Ensure other required columns exist
         required_columns = ['country', 'request_type', 'age_group', 'continent']
@@ -197,14 +364,179 @@ def load_data():
         })
         df['date'] = df['timestamp'].dt.date
         df['hour'] = df['timestamp'].dt.hour
-        df['day'] = df['timestamp'].dt.day_name()
-        df['month'] = df['timestamp'].dt.month_name()
+    
+    # Rows in time order (undated rows last), so a date range is a contiguous slice
+    # found by binary search
+    df = df.sort_values('timestamp', kind='mergesort', ignore_index=True)
+    
+    # Calendar day as datetime64 so date filtering and grouping stay vectorized
+    df['date_ns'] = df['timestamp'].values.astype('datetime64[D]')
+    
+    # Low-cardinality columns as categoricals: isin/groupby work on integer codes
+    for c in ('country', 'continent', 'age_group', 'request_type'):
+        df[c] = df[c].astype('category')
+    
+    # Age groups in display order, so counts by age group come out sorted
+    extra_ages = sorted(set(df['age_group'].cat.categories) - set(AGE_ORDER))
+    df['age_group'] = df['age_group'].cat.set_categories(AGE_ORDER + extra_ages, ordered=True)
+    
+    # Integer columns (hour, status codes, ...) in the narrowest type that holds them, so
+    # every scan over them reads fewer bytes
+    for c in df.select_dtypes(include='integer').columns:
+        df[c] = pd.to_numeric(df[c], downcast='unsigned' if df[c].min() >= 0 else 'integer')
+    
+    # The per-row datetime.date objects of the date column collapse to one per day
+    if df['date'].dtype == object:
+        df['date'] = df['date'].astype('category')
+    
+    # Remaining text columns (IP addresses, ...) as Arrow-backed strings: one buffer instead
+    # of a Python object per row, and the data table's text filters run in Arrow kernels
+    for c in df.select_dtypes(include='object').columns:
+        if pd.api.types.infer_dtype(df[c], skipna=True) == 'string':
+            df[c] = df[c].astype('string[pyarrow]')
     
     return df
 
 # Load the data
 df = load_data()
 
+# First and last day of the data, for the date picker bounds and Reset
+_MIN_DATE = pd.to_datetime(df['timestamp'].min()).date()
+_MAX_DATE = pd.to_datetime(df['timestamp'].max()).date()
+
+# Columns shown in the data table and written by the exports: the log's own columns,
+# without the ones load_data derives for filtering
+EXPORT_COLS = [c for c in df.columns if c != 'date_ns']
+
+# Largest number of rows agg-store may have. The store ships with every dashboard load,
+# so above this the metric cards are computed on the server instead.
+AGG_STORE_MAX_ROWS = 5_000
+
+# Request counts per (day, country, age group, request type), shipped to the browser once
+# so the metric cards can be filtered clientside, or None when that would exceed
+# AGG_STORE_MAX_ROWS. Dimensions are sent as category codes to keep the payload small.
+# When every country belongs to a single continent, continent isn't a key of its own: the
+# store carries each country's continent code instead.
+def build_agg_store(df):
+    categories = {c: df[c].cat.categories.tolist() for c in ('continent', 'country', 'age_group', 'request_type')}
+    dims = ['country', 'age_group', 'request_type']
+    pairs = df[['country', 'continent']].drop_duplicates()
+    continent_of_country = None
+    if not pairs.isna().any().any() and not pairs['country'].duplicated().any():
+        continent_of_country = np.full(len(categories['country']), -1)
+        continent_of_country[pairs['country'].cat.codes.values] = pairs['continent'].cat.codes.values
+    else:
+        dims.insert(0, 'continent')
+    
+    agg = df.groupby(['date_ns'] + dims, observed=True).size().reset_index(name='count')
+    if len(agg) > AGG_STORE_MAX_ROWS:
+        return None
+    store = {
+        'categories': categories,
+        'codes': {c: agg[c].cat.codes.tolist() for c in dims},
+        'date': agg['date_ns'].dt.strftime('%Y-%m-%d').tolist(),
+        'count': agg['count'].tolist()
+    }
+    if continent_of_country is not None:
+        store['continent_of_country'] = continent_of_country.tolist()
+    return store
+
+AGG_STORE = build_agg_store(df)
+
+# Requests per day over the whole frame, served directly when no categorical filter is set
+DAILY_COUNTS = df.groupby('date_ns', sort=True).size()
+
+# Integer category codes of the filterable columns, so the filter never compares strings
+CATEGORY_CODES = {c: df[c].cat.codes.values for c in ('continent', 'country', 'age_group', 'request_type')}
+
+# Inverted index of the filterable columns: category code -> positions of its rows. Used
+# by the filter when a selection matches only a few rows.
+ROW_INDEX = {c: df.groupby(codes).indices for c, codes in CATEGORY_CODES.items()}
+
+# Share of all rows below which a categorical selection is filtered through ROW_INDEX
+SPARSE_FILTER_FRACTION = 0.05
+
+# The mask returned whenever the filters select every row (first load, after Reset), so
+# callbacks can recognize that case by identity and serve precomputed tables
+ALL_ROWS = np.ones(len(df), dtype=bool)
+ALL_ROWS.setflags(write=False)
+
+# Day number of each row counted from the first day in the data, so per-day counts are a
+# np.bincount instead of a groupby. Rows without a valid timestamp get -1.
+def build_day_offsets(df):
+    days = df['date_ns'].values.astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    first_day = days[valid].min() if valid.any() else np.datetime64('1970-01-01', 'D')
+    offsets = np.where(valid, (days - first_day).astype(np.int32), np.int32(-1))
+    return first_day, offsets
+
+FIRST_DAY, DAY_OFFSETS = build_day_offsets(df)
+DAY_OFFSETS.setflags(write=False)
+N_DAYS = int(DAY_OFFSETS.max()) + 1 if len(DAY_OFFSETS) else 0
+
+# Number of rows with a timestamp; df is sorted, so they come before the undated ones
+N_DATED = int(np.count_nonzero(DAY_OFFSETS >= 0))
+
+# Position of the first row of every day offset, plus N_DATED after the last day. The rows
+# of a date range then come from two lookups by integer day number, without comparing
+# datetimes at all.
+DAY_STARTS = DAY_OFFSETS[:N_DATED].searchsorted(np.arange(N_DAYS + 1))
+DAY_STARTS.setflags(write=False)
+
+# Day offset of a date picker value
+def day_offset(date):
+    return int((np.datetime64(date, 'D') - FIRST_DAY).astype(int))
+
+# Day of week (0 = Monday) and month (1-12) of every day offset. Weekday and month counts
+# regroup the per-day counts through these instead of decoding each row's timestamp.
+CALENDAR_DAYS = FIRST_DAY + np.arange(N_DAYS)
+DAY_OF_WEEK = ((CALENDAR_DAYS.astype(np.int64) + 3) % 7).astype(np.int8)  # 1970-01-01 was a Thursday
+MONTH_OF_DAY = (CALENDAR_DAYS.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+
+# Heatmap cell of each row, country code * number of request types + request type code,
+# or -1 when either is missing. Counting a filtered set of rows per cell is then a single
+# gather and np.bincount.
+N_COUNTRIES = len(df['country'].cat.categories)
+N_REQUEST_TYPES = len(df['request_type'].cat.categories)
+
+def build_country_request_cells():
+    countries = CATEGORY_CODES['country'].astype(np.intp)
+    types = CATEGORY_CODES['request_type'].astype(np.intp)
+    return np.where((countries >= 0) & (types >= 0), countries * N_REQUEST_TYPES + types, -1)
+
+COUNTRY_REQUEST_CELLS = build_country_request_cells()
+COUNTRY_REQUEST_CELLS.setflags(write=False)
+
+# Requests per (day, country, request type) as a dense int32 array indexed by day offset
+# and category codes. With only dates and countries filtered, the heatmap just sums a
+# slice of it.
+def build_country_request_cube():
+    n_cells = N_COUNTRIES * N_REQUEST_TYPES
+    valid = (DAY_OFFSETS >= 0) & (COUNTRY_REQUEST_CELLS >= 0)
+    cells = DAY_OFFSETS[valid].astype(np.intp) * n_cells + COUNTRY_REQUEST_CELLS[valid]
+    counts = np.bincount(cells, minlength=N_DAYS * n_cells)
+    return counts.astype(np.int32).reshape(N_DAYS, N_COUNTRIES, N_REQUEST_TYPES)
+
+COUNTRY_REQUEST_CUBE = build_country_request_cube()
+
+# Requests per (country, request type) of the rows without a date. They aren't in the
+# cube, but filter_mask keeps them when no date range is set, so the heatmap adds them then.
+def build_undated_country_requests():
+    cells = COUNTRY_REQUEST_CELLS[DAY_OFFSETS < 0]
+    counts = np.bincount(cells[cells >= 0], minlength=N_COUNTRIES * N_REQUEST_TYPES)
+    return counts.reshape(N_COUNTRIES, N_REQUEST_TYPES)
+
+UNDATED_COUNTRY_REQUESTS = build_undated_country_requests()
+
+# Dropdown options, built once from the (already unique) categories
+def build_options(column):
+    return [{'label': value, 'value': value} for value in df[column].cat.categories.sort_values().tolist()]
+
+CONTINENT_OPTIONS = build_options('continent')
+COUNTRY_OPTIONS = build_options('country')
+AGE_GROUP_OPTIONS = build_options('age_group')
+REQUEST_TYPE_OPTIONS = build_options('request_type')
+
 # Define the app layout
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
@@ -288,6 +620,61 @@ register_layout = html.Div([
     ], className='login-container')
 ], className='login-page')
 
+# Home page: key metrics, the four overview charts and the statistics table
+_HOME_LAYOUT = [
+    # Key metrics
+    html.Div([
+        html.Div([
+            html.H4('Total Requests', style={'color': 'white'}),
+            html.H2(id='total-requests', children='10,000', style={'color': 'white'}),
+        ], className='metric-card', style={'backgroundColor': '#e74c3c'}),
+        
+        html.Div([
+            html.H4('Demo Requests', style={'color': 'white'}),
+            html.H2(id='demo-requests', children='2,489', style={'color': 'white'}),
+        ], className='metric-card', style={'backgroundColor': '#2ecc71'}),
+        
+        html.Div([
+            html.H4('Job Placements', style={'color': 'white'}),
+            html.H2(id='job-placements', children='2,441', style={'color': 'white'}),
+        ], className='metric-card', style={'backgroundColor': '#3498db'}),
+        
+        html.Div([
+            html.H4('AI Assistant Requests', style={'color': '#2c3e50'}),
+            html.H2(id='ai-assistant-requests', children='2,506', style={'color': '#2c3e50'}),
+        ], className='metric-card', style={'backgroundColor': '#FFA500'})
+    ], className='metrics-container'),
+    
+    # Charts
+    html.Div([
+        html.Div([
+            html.H3('Request Volume Over Time'),
+            dcc.Graph(id='time-series-chart', config={'displayModeBar': False})
+        ], className='chart-container'),
+        
+        html.Div([
+            html.H3('Request Type Distribution'),
+            dcc.Graph(id='request-type-pie', config={'displayModeBar': False})
+        ], className='chart-container'),
+        
+        html.Div([
+            html.H3('Requests by Country'),
+            dcc.Graph(id='country-bar-chart', config={'displayModeBar': False})
+        ], className='chart-container'),
+        
+        html.Div([
+            html.H3('Requests by Age Group'),
+            dcc.Graph(id='age-group-chart', config={'displayModeBar': False})
+        ], className='chart-container'),
+    ], className='charts-grid'),
+    
+    # Statistics section
+    html.Div([
+        html.H3('Request Statistics'),
+        html.Div(id='statistics-table', className='stats-table')
+    ], className='statistics-section')
+]
+
 # Dashboard layout
 dashboard_layout = html.Div([
     # Header
@@ -325,6 +712,12 @@ dashboard_layout = html.Div([
     # Add a store component to track the current page
     dcc.Store(id='current-page', data='home'),
     
+    # Pre-aggregated counts used by the clientside metrics callback, when small enough
+    dcc.Store(id='agg-store', data=AGG_STORE),
+    
+    # Filter selection of the data table and the exports, see update_filtered_cache
+    dcc.Store(id='filtered-cache'),
+    
     # Main content
     html.Div([
         # Two-column layout
@@ -338,7 +731,7 @@ dashboard_layout = html.Div([
                     html.Label('Continent', style={'fontWeight': 'bold'}),
                     dcc.Dropdown(
                         id='continent-filter',
-                        options=[{'label': continent, 'value': continent} for continent in sorted(df['continent'].unique())],
+                        options=CONTINENT_OPTIONS,
                         value=[],
                         multi=True,
                         placeholder='Select continents...',
@@ -351,7 +744,7 @@ dashboard_layout = html.Div([
                     html.Label('Country', style={'fontWeight': 'bold'}),
                     dcc.Dropdown(
                         id='country-filter',
-                        options=[{'label': country, 'value': country} for country in sorted(df['country'].unique())],
+                        options=COUNTRY_OPTIONS,
                         value=[],
                         multi=True,
                         placeholder='Select countries...',
@@ -364,7 +757,7 @@ dashboard_layout = html.Div([
                     html.Label('Age Group', style={'fontWeight': 'bold'}),
                     dcc.Dropdown(
                         id='age-group-filter',
-                        options=[{'label': age, 'value': age} for age in sorted(df['age_group'].unique())],
+                        options=AGE_GROUP_OPTIONS,
                         value=[],
                         multi=True,
                         placeholder='Select age groups...',
@@ -377,7 +770,7 @@ dashboard_layout = html.Div([
                     html.Label('Request Type', style={'fontWeight': 'bold'}),
                     dcc.Dropdown(
                         id='request-type-filter',
-                        options=[{'label': req, 'value': req} for req in sorted(df['request_type'].unique())],
+                        options=REQUEST_TYPE_OPTIONS,
                         value=[],
                         multi=True,
                         placeholder='Select request types...',
@@ -390,10 +783,10 @@ dashboard_layout = html.Div([
                     html.Label('Date Range', style={'fontWeight': 'bold'}),
                     dcc.DatePickerRange(
                         id='date-range',
-                        min_date_allowed=df['timestamp'].min().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].min()).date(),
-                        max_date_allowed=df['timestamp'].max().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].max()).date(),
-                        start_date=df['timestamp'].min().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].min()).date(),
-                        end_date=df['timestamp'].max().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].max()).date(),
+                        min_date_allowed=_MIN_DATE,
+                        max_date_allowed=_MAX_DATE,
+                        start_date=_MIN_DATE,
+                        end_date=_MAX_DATE,
                         className='date-picker'
                     ),
                 ], className='filter-group'),
@@ -406,59 +799,7 @@ dashboard_layout = html.Div([
             
             # Right column - Dashboard content
             html.Div([
-                html.Div(id='dashboard-content', children=[
-                    # Key metrics
-                    html.Div([
-                        html.Div([
-                            html.H4('Total Requests', style={'color': 'white'}),
-                            html.H2(id='total-requests', children='10,000', style={'color': 'white'}),
-                        ], className='metric-card', style={'backgroundColor': '#e74c3c'}),
-                        
-                        html.Div([
-                            html.H4('Demo Requests', style={'color': 'white'}),
-                            html.H2(id='demo-requests', children='2,489', style={'color': 'white'}),
-                        ], className='metric-card', style={'backgroundColor': '#2ecc71'}),
-                        
-                        html.Div([
-                            html.H4('Job Placements', style={'color': 'white'}),
-                            html.H2(id='job-placements', children='2,441', style={'color': 'white'}),
-                        ], className='metric-card', style={'backgroundColor': '#3498db'}),
-                        
-                        html.Div([
-                            html.H4('AI Assistant Requests', style={'color': '#2c3e50'}),
-                            html.H2(id='ai-assistant-requests', children='2,506', style={'color': '#2c3e50'}),
-                        ], className='metric-card', style={'backgroundColor': '#FFA500'})
-                    ], className='metrics-container'),
-                    
-                    # Charts
-                    html.Div([
-                        html.Div([
-                            html.H3('Request Volume Over Time'),
-                            dcc.Graph(id='time-series-chart', config={'displayModeBar': False})
-                        ], className='chart-container'),
-                        
-                        html.Div([
-                            html.H3('Request Type Distribution'),
-                            dcc.Graph(id='request-type-pie', config={'displayModeBar': False})
-                        ], className='chart-container'),
-                        
-                        html.Div([
-                            html.H3('Requests by Country'),
-                            dcc.Graph(id='country-bar-chart', config={'displayModeBar': False})
-                        ], className='chart-container'),
-                        
-                        html.Div([
-                            html.H3('Requests by Age Group'),
-                            dcc.Graph(id='age-group-chart', config={'displayModeBar': False})
-                        ], className='chart-container'),
-                    ], className='charts-grid'),
-                    
-                    # Statistics section
-                    html.Div([
-                        html.H3('Request Statistics'),
-                        html.Div(id='statistics-table', className='stats-table')
-                    ], className='statistics-section')
-                ])
+                html.Div(id='dashboard-content', children=_HOME_LAYOUT)
             ], className='dashboard-content')
         ], className='two-column-layout')
     ], className='main-content')
@@ -532,20 +873,15 @@ def register_user(n_clicks, username, email, password, confirm_password):
             return f"Username '{username}' is already taken.", "", dash.no_update
         
         # Check if email already exists
-        for user_id, user_data in USERS.items():
-            if user_data.get('email') == email:
-                return f"Email '{email}' is already registered.", "", dash.no_update
+        if email in EMAIL_INDEX:
+            return f"Email '{email}' is already registered.", "", dash.no_update
         
         # Create new user
-        new_user = {
-            'id': username,
-            'username': username,
-            'password': password,
-            'email': email
-        }
+        new_user = make_user(username, password, email)
         
         # Add to users dictionary
         USERS[username] = new_user
+        EMAIL_INDEX[email] = username
         
         # Save users to file
         if save_users(USERS):
@@ -567,10 +903,10 @@ def register_user(n_clicks, username, email, password, confirm_password):
 )
 def login(n_clicks, username, password):
     if n_clicks > 0:
-        if username in USERS and USERS[username]['password'] == password:
+        if username in USERS and check_password(USERS[username], password):
             # In a real app, you would use login_user(User(username))
             user_data = USERS[username]
-            user = User(user_data['id'], user_data['username'], user_data['password'], user_data.get('email'))
+            user = User(user_data['id'], user_data['username'], user_data.get('email'))
             login_user(user)
             return '/dashboard', ''
         else:
@@ -590,107 +926,318 @@ def logout(n_clicks):
         return '/login'
     return dash.no_update
 
-# Filter data function
-def filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = df.copy()
+# Boolean row mask for a filter combination. Every callback on a page fires with
+# the same filter values, so only the first one pays for the scan over df; the rest
+# are served from the cache. id(df) is part of the key so a reloaded frame never
+# reuses entries computed against the previous one.
+@functools.lru_cache(maxsize=64)
+def _filter_cached(df_id, continents, countries, age_groups, request_types, start_date, end_date):
+    # Category codes selected in each categorical filter; values that aren't categories
+    # (-1) can never match
+    active = []
+    for column, selected in (('continent', continents), ('country', countries),
+                             ('age_group', age_groups), ('request_type', request_types)):
+        if selected:
+            codes = df[column].cat.categories.get_indexer(list(selected))
+            active.append((column, codes[codes >= 0]))
+    
+    # df is sorted by time, so the date range is the slice [lo, hi) from the first row of
+    # the start day to the first row after the end day; an unset bound leaves that side open
+    lo, hi = 0, len(df)
+    if start_date:
+        lo = int(DAY_STARTS[np.clip(day_offset(start_date), 0, N_DAYS)])
+        hi = N_DATED
+    if end_date:
+        hi = max(lo, int(DAY_STARTS[np.clip(day_offset(end_date) + 1, 0, N_DAYS)]))
+    rows = slice(lo, hi)
+    
+    # When one filter matches only a small share of the rows in the date range, start
+    # from its rows in the inverted index and check the other conditions on those rows
+    # alone instead of building masks over the whole range. The index lists are sorted,
+    # so their part inside the range is found by binary search.
+    if active:
+        postings = [[ROW_INDEX[column][code] for code in codes if code in ROW_INDEX[column]]
+                    for column, codes in active]
+        postings = [[p[p.searchsorted(lo):p.searchsorted(hi)] for p in lists] for lists in postings]
+        sizes = [sum(len(p) for p in lists) for lists in postings]
+        best = int(np.argmin(sizes))
+        if sizes[best] < SPARSE_FILTER_FRACTION * (hi - lo):
+            active.pop(best)
+            rows = np.concatenate([np.empty(0, dtype=np.intp)] + postings[best])
+    
+    # Compose a single boolean mask over the candidate rows from the remaining filters.
+    # Each filter is a lookup table of its selected categories indexed by the rows' codes,
+    # which ORs the per-category row sets in one gather; the extra last slot is what a
+    # missing value (code -1) reads, and it is never selected.
+    keep = np.ones(hi - lo if isinstance(rows, slice) else len(rows), dtype=bool)
+    for column, codes in active:
+        selected = np.zeros(len(df[column].cat.categories) + 1, dtype=bool)
+        selected[codes] = True
+        keep &= selected[CATEGORY_CODES[column][rows]]
+    
+    if isinstance(rows, slice) and lo == 0 and hi == len(df) and keep.all():
+        return ALL_ROWS
+    mask = np.zeros(len(df), dtype=bool)
+    if isinstance(rows, slice):
+        mask[rows] = keep
+    else:
+        mask[rows[keep]] = True
     
+    # Cached and shared between callbacks, so make sure nobody modifies it in place
+    mask.setflags(write=False)
+    return mask
+
+# Memoize a chart callback on its filter values. Users toggle back and forth between the
+# same combinations, and a cached figure skips the counting and the validation of every
+# trace property; it is stored as a dict and rebuilt with go.Figure. Lists become
+# frozensets so they can be hashed; id(df) keeps cached figures from outliving a reload.
+# Errors are not cached: exceptions pass through lru_cache, and the error figures the
+# chart builders return themselves (marked with meta=ERROR_FIGURE) are raised past it in
+# an UncachedFigure, so the next call builds the chart again.
+ERROR_FIGURE = 'error'
+
+class UncachedFigure(Exception):
+    def __init__(self, figure):
+        super().__init__()
+        self.figure = figure
+
+def cache_figure(func):
+    @functools.lru_cache(maxsize=128)
+    def cached(df_id, *args):
+        figure = func(*args).to_dict()
+        if figure['layout'].get('meta') == ERROR_FIGURE:
+            raise UncachedFigure(figure)
+        return figure
+    
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = tuple(frozenset(arg) if isinstance(arg, list) else arg for arg in args)
+        try:
+            return go.Figure(cached(id(df), *key))
+        except UncachedFigure as e:
+            return go.Figure(e.figure)
+    return wrapper
+
+# Cache key for a filter combination. Selections are order-insensitive, so frozensets
+# give one cache entry per combination.
+def _filter_key(df, continents, countries, age_groups, request_types, start_date, end_date):
+    return (
+        id(df),
+        frozenset(continents or ()),
+        frozenset(countries or ()),
+        frozenset(age_groups or ()),
+        frozenset(request_types or ()),
+        start_date,
+        end_date
+    )
+
+# Dash fires a page's callbacks concurrently when a filter changes, and lru_cache doesn't
+# stop several threads from computing the same missing entry at once. Filtering under
+# one lock lets the first callback compute the mask (and row positions) while the others wait
+# and then read it from the cache. Reentrant because the row cache filters too.
+_FILTER_LOCK = threading.RLock()
+
+# Boolean mask of the rows matching the filters. Callbacks index just the columns they
+# need with it instead of materializing a filtered copy of every column.
+def filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date):
     try:
-        # Ensure timestamp is datetime type for filtering
-        if not pd.api.types.is_datetime64_any_dtype(filtered_df['timestamp']):
-            filtered_df['timestamp'] = pd.to_datetime(filtered_df['timestamp'], errors='coerce')
-        
-        # Convert string dates to datetime for comparison
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        if isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-        
-        # Apply date filter
-        filtered_df = filtered_df[(filtered_df['timestamp'].dt.date >= start_date) & 
-                                (filtered_df['timestamp'].dt.date <= end_date)]
-        
-        # Apply continent filter if selected
-        if continents and 'continent' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['continent'].isin(continents)]
-        
-        # Apply country filter if selected
-        if countries and 'country' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['country'].isin(countries)]
-        
-        # Apply age group filter if selected
-        if age_groups and 'age_group' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['age_group'].isin(age_groups)]
-        
-        # Apply request type filter if selected
-        if request_types and 'request_type' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['request_type'].isin(request_types)]
-    
+        with _FILTER_LOCK:
+            return _filter_cached(
+                *_filter_key(df, continents, countries, age_groups, request_types, start_date, end_date)
+            )
     except Exception as e:
-        print(f"Error in filter_dataframe: {e}")
-        # Return original dataframe if filtering fails
-        return df
-    
-    return filtered_df
+        print(f"Error in filter_mask: {e}")
+        # Keep every row if filtering fails
+        return np.ones(len(df), dtype=bool)
 
-# Update metrics callback
-@app.callback(
-    [Output('total-requests', 'children'),
-    Output('demo-requests', 'children'),
-    Output('job-placements', 'children'),
-    Output('ai-assistant-requests', 'children')],
-    [Input('continent-filter', 'value'),
-    Input('country-filter', 'value'),
-    Input('age-group-filter', 'value'),
-    Input('request-type-filter', 'value'),
-    Input('date-range', 'start_date'),
-    Input('date-range', 'end_date')]
-)
-@handle_error
-def update_metrics(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
-    
-    total_requests = len(filtered_df)
-    
-    # Check if 'request_type' column exists
-    if 'request_type' in filtered_df.columns:
-        demo_requests = len(filtered_df[filtered_df['request_type'] == 'demo'])
-        job_placements = len(filtered_df[filtered_df['request_type'] == 'job'])
-        ai_assistant = len(filtered_df[filtered_df['request_type'] == 'ai_assistant'])
-    else:
-        demo_requests = job_placements = ai_assistant = 0
-    
-    return f"{total_requests:,}", f"{demo_requests:,}", f"{job_placements:,}", f"{ai_assistant:,}"
+# The row positions of each filter combination are cached as well, so the data table and
+# the export share one filter pass per combination. Positions take 8 bytes per matching
+# row rather than a full filtered frame, and one df.take rebuilds the frame from them.
+@functools.lru_cache(maxsize=32)
+def _filtered_rows_cached(df_id, continents, countries, age_groups, request_types, start_date, end_date):
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
+    if mask is ALL_ROWS:
+        return slice(None)
+    rows = np.flatnonzero(mask)
+    # df is sorted by time, so a date range alone selects one contiguous run of rows. That
+    # is kept as a slice, which df.iloc serves as a view without copying anything.
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        return slice(int(rows[0]), int(rows[-1]) + 1)
+    return rows
 
-# Update time series chart callback
-@app.callback(
-    Output('time-series-chart', 'figure'),
-    [Input('continent-filter', 'value'),
-    Input('country-filter', 'value'),
-    Input('age-group-filter', 'value'),
-    Input('request-type-filter', 'value'),
-    Input('date-range', 'start_date'),
-    Input('date-range', 'end_date')]
-)
+# Positions of the rows matching the filters, as a slice or an array of positions
+def filtered_rows(df, continents, countries, age_groups, request_types, start_date, end_date):
+    with _FILTER_LOCK:
+        return _filtered_rows_cached(
+            *_filter_key(df, continents, countries, age_groups, request_types, start_date, end_date)
+        )
+
+# Filter data function
+def filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date):
+    rows = filtered_rows(df, continents, countries, age_groups, request_types, start_date, end_date)
+    if isinstance(rows, slice):
+        return df if rows == slice(None) else df.iloc[rows]
+    return df.take(rows)
+
+# The count helpers below return a 'count' Series indexed by label, with the index named
+# after the counted dimension, which the charts plot directly.
+
+# Requests per category of a categorical column over the rows in mask, via np.bincount on
+# the category codes. In category order, without the categories that have no requests.
+def count_by(column, mask):
+    if mask is ALL_ROWS:
+        return BASE_COUNTS[column]
+    categories = df[column].cat.categories
+    codes = df[column].cat.codes.values[mask]
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    present = np.flatnonzero(counts)
+    return pd.Series(counts[present], index=categories[present].rename(column), name='count')
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+# Requests per hour of day over the rows in mask, in hour order
+def count_hours(mask):
+    if mask is ALL_ROWS:
+        return BASE_COUNTS['hour']
+    return df['hour'][mask].value_counts().sort_index()
+
+# Requests per day offset over the rows in mask; undated rows are left out
+def count_per_day(mask):
+    offsets = DAY_OFFSETS[mask]
+    return np.bincount(offsets[offsets >= 0], minlength=N_DAYS)
+
+# Requests per day of week (Monday first) over the rows in mask, without the days that
+# have no requests
+def count_days(mask):
+    if mask is ALL_ROWS:
+        return BASE_COUNTS['day']
+    counts = np.bincount(DAY_OF_WEEK, weights=count_per_day(mask), minlength=7).astype(np.int64)
+    present = np.flatnonzero(counts)
+    return pd.Series(counts[present], index=pd.Index(np.array(DAY_NAMES)[present], name='day'), name='count')
+
+# Requests per calendar month over the rows in mask, without the months that have no
+# requests
+def count_months(mask):
+    if mask is ALL_ROWS:
+        return BASE_COUNTS['month']
+    counts = np.bincount(MONTH_OF_DAY - 1, weights=count_per_day(mask), minlength=12).astype(np.int64)
+    present = np.flatnonzero(counts)
+    return pd.Series(counts[present], index=pd.Index(np.array(MONTH_NAMES)[present], name='month'), name='count')
+
+# The same tables over the whole frame, computed once at startup for the unfiltered view
+BASE_COUNTS = {
+    **{c: count_by(c, slice(None)) for c in ('continent', 'country', 'age_group', 'request_type')},
+    'hour': count_hours(slice(None)),
+    'day': count_days(slice(None)),
+    'month': count_months(slice(None))
+}
+
+# Update metrics clientside: the cards are plain counts, so the browser sums them from
+# agg-store without a round trip to the server on every filter change
+METRICS_CLIENTSIDE = """
+    function(store, continents, countries, ageGroups, requestTypes, startDate, endDate) {
+        if (!store) {
+            return ['0', '0', '0', '0'];
+        }
+        const columns = ['continent', 'country', 'age_group', 'request_type'];
+        const selected = [continents, countries, ageGroups, requestTypes].map(function(values, i) {
+            if (!values || values.length === 0) {
+                return null;
+            }
+            const categories = store.categories[columns[i]];
+            return new Set(values.map(function(v) { return categories.indexOf(v); }));
+        });
+        const start = startDate ? String(startDate).slice(0, 10) : null;
+        const end = endDate ? String(endDate).slice(0, 10) : null;
+        const requestTypeNames = store.categories.request_type;
+        const codeOf = function(column, i) {
+            if (column === 'continent' && !store.codes.continent) {
+                return store.continent_of_country[store.codes.country[i]];
+            }
+            return store.codes[column][i];
+        };
+        const byType = {};
+        let total = 0;
+        for (let i = 0; i < store.count.length; i++) {
+            const date = store.date[i];
+            if ((start && date < start) || (end && date > end)) {
+                continue;
+            }
+            let keep = true;
+            for (let j = 0; j < columns.length; j++) {
+                if (selected[j] && !selected[j].has(codeOf(columns[j], i))) {
+                    keep = false;
+                    break;
+                }
+            }
+            if (!keep) {
+                continue;
+            }
+            const count = store.count[i];
+            const name = requestTypeNames[store.codes.request_type[i]];
+            total += count;
+            byType[name] = (byType[name] || 0) + count;
+        }
+        const format = function(n) { return n.toLocaleString('en-US'); };
+        return [format(total), format(byType['demo'] || 0), format(byType['job'] || 0), format(byType['ai_assistant'] || 0)];
+    }
+    """
+
+METRIC_OUTPUTS = [Output('total-requests', 'children'),
+                  Output('demo-requests', 'children'),
+                  Output('job-placements', 'children'),
+                  Output('ai-assistant-requests', 'children')]
+
+FILTER_INPUTS = [Input('continent-filter', 'value'),
+                 Input('country-filter', 'value'),
+                 Input('age-group-filter', 'value'),
+                 Input('request-type-filter', 'value'),
+                 Input('date-range', 'start_date'),
+                 Input('date-range', 'end_date')]
+
+if AGG_STORE is not None:
+    app.clientside_callback(METRICS_CLIENTSIDE, METRIC_OUTPUTS, [Input('agg-store', 'data')] + FILTER_INPUTS)
+else:
+    # Update metrics callback: the cards from the shared cached mask, with one bincount
+    # of the matching rows' request types
+    @app.callback(METRIC_OUTPUTS, FILTER_INPUTS)
+    @handle_error
+    def update_metrics(continents, countries, age_groups, request_types, start_date, end_date):
+        mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
+        total_requests = len(df) if mask is ALL_ROWS else int(np.count_nonzero(mask))
+        by_type = count_by('request_type', mask)
+        demo_requests = int(by_type.get('demo', 0))
+        job_placements = int(by_type.get('job', 0))
+        ai_assistant = int(by_type.get('ai_assistant', 0))
+        return f"{total_requests:,}", f"{demo_requests:,}", f"{job_placements:,}", f"{ai_assistant:,}"
+
+# Build the time series chart
 @handle_error
+@cache_figure
 def update_time_series(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
-    
     try:
-        # Ensure timestamp is datetime type
-        if not pd.api.types.is_datetime64_any_dtype(filtered_df['timestamp']):
-            filtered_df['timestamp'] = pd.to_datetime(filtered_df['timestamp'], errors='coerce')
-            
-        # Group by date and count requests
-        time_series_data = filtered_df.groupby(filtered_df['timestamp'].dt.date).size().reset_index(name='count')
-        time_series_data.columns = ['date', 'count']
+        if not (continents or countries or age_groups or request_types):
+            # Only the date range applies, so slice the precomputed daily histogram
+            daily = DAILY_COUNTS.loc[start_date:end_date]
+            dates, counts = daily.index.values, daily.values
+        else:
+            # Count requests per day by binning the day offsets of the matching rows
+            mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
+            counts = count_per_day(mask)
+            days = np.flatnonzero(counts)
+            dates, counts = FIRST_DAY + days, counts[days]
         
         # Create the figure
-        fig = px.line(
-            time_series_data, 
-            x='date', 
-            y='count',
-            labels={'date': 'Date', 'count': 'Number of Requests'},
-            template='plotly_white'
+        fig = go.Figure(
+            go.Scatter(
+                x=dates,
+                y=counts,
+                mode='lines',
+                hovertemplate='Date=%{x}<br>Number of Requests=%{y}<extra></extra>'
+            ),
+            layout=dict(template='plotly_white')
         )
         
         fig.update_layout(
@@ -721,40 +1268,31 @@ def update_time_series(continents, countries, age_groups, request_types, start_d
             xref="paper", yref="paper",
             x=0.5, y=0.5, showarrow=False
         )
-        fig.update_layout(height=300)  # Set consistent height
+        fig.update_layout(height=300, meta=ERROR_FIGURE)  # Set consistent height
         return fig
 
-# Update request type pie chart callback
-@app.callback(
-    Output('request-type-pie', 'figure'),
-    [Input('continent-filter', 'value'),
-    Input('country-filter', 'value'),
-    Input('age-group-filter', 'value'),
-    Input('request-type-filter', 'value'),
-    Input('date-range', 'start_date'),
-    Input('date-range', 'end_date')]
-)
+# Build the request type pie chart
 @handle_error
+@cache_figure
 def update_request_type_pie(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
     try:
         # Check if request_type column exists
-        if 'request_type' not in filtered_df.columns:
+        if 'request_type' not in df.columns:
             raise ValueError("'request_type' column not found in the dataset")
             
-        # Group by request type and count
-        request_type_counts = filtered_df['request_type'].value_counts().reset_index()
-        request_type_counts.columns = ['request_type', 'count']
+        # Count requests per request type
+        request_type_counts = count_by('request_type', mask)
         
         # Create the figure
-        fig = px.pie(
-            request_type_counts, 
-            values='count', 
-            names='request_type',
+        fig = go.Figure(go.Pie(
+            labels=request_type_counts.index,
+            values=request_type_counts.values,
             hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
+            marker=dict(colors=_SET3),
+            hovertemplate='request_type=%{label}<br>count=%{value}<extra></extra>'
+        ))
         
         fig.update_layout(
             margin=dict(l=20, r=20, t=30, b=20),
@@ -776,43 +1314,36 @@ def update_request_type_pie(continents, countries, age_groups, request_types, st
             xref="paper", yref="paper",
             x=0.5, y=0.5, showarrow=False
         )
-        fig.update_layout(height=300)  # Set consistent height
+        fig.update_layout(height=300, meta=ERROR_FIGURE)  # Set consistent height
         return fig
 
-@app.callback(
-    Output('country-bar-chart', 'figure'),
-    [Input('continent-filter', 'value'),
-    Input('country-filter', 'value'),
-    Input('age-group-filter', 'value'),
-    Input('request-type-filter', 'value'),
-    Input('date-range', 'start_date'),
-    Input('date-range', 'end_date')]
-)
+# Build the country bar chart
 @handle_error
+@cache_figure
 def update_country_bar_chart(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
     try:
         # Check if country column exists
-        if 'country' not in filtered_df.columns:
+        if 'country' not in df.columns:
             raise ValueError("'country' column not found in the dataset")
             
-        # Group by country and count
-        country_counts = filtered_df['country'].value_counts().reset_index()
-        country_counts.columns = ['country', 'count']
+        # Count requests per country
+        country_counts = count_by('country', mask)
         
-        # Sort by count and take top 10
-        country_counts = country_counts.sort_values('count', ascending=False).head(10)
+        # Take the top 10 by count
+        country_counts = country_counts.nlargest(10)
         
         # Create the figure
-        fig = px.bar(
-            country_counts, 
-            x='count', 
-            y='country',
-            orientation='h',
-            labels={'count': 'Number of Requests', 'country': 'Country'},
-            color='count',
-            color_continuous_scale='Viridis'
+        fig = go.Figure(
+            go.Bar(
+                x=country_counts.values,
+                y=country_counts.index,
+                orientation='h',
+                marker=dict(color=country_counts.values, coloraxis='coloraxis'),
+                hovertemplate='Number of Requests=%{x}<br>Country=%{y}<extra></extra>'
+            ),
+            layout=dict(coloraxis=dict(colorscale=_VIRIDIS))
         )
         
         fig.update_layout(
@@ -842,42 +1373,27 @@ def update_country_bar_chart(continents, countries, age_groups, request_types, s
             xref="paper", yref="paper",
             x=0.5, y=0.5, showarrow=False
         )
-        fig.update_layout(height=300)  # Set consistent height
+        fig.update_layout(height=300, meta=ERROR_FIGURE)  # Set consistent height
         return fig
 
-# Update age group chart callback
-@app.callback(
-    Output('age-group-chart', 'figure'),
-    [Input('continent-filter', 'value'),
-    Input('country-filter', 'value'),
-    Input('age-group-filter', 'value'),
-    Input('request-type-filter', 'value'),
-    Input('date-range', 'start_date'),
-    Input('date-range', 'end_date')]
-)
+# Build the age group chart
 @handle_error
+@cache_figure
 def update_age_group_chart(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
-    # Group by age group and count
-    age_group_counts = filtered_df['age_group'].value_counts().reset_index()
-    age_group_counts.columns = ['age_group', 'count']
-    
-    # Define the correct order for age groups
-    age_order = ['18-24', '25-34', '35-44', '45-54', '55-64', '65+']
-    
-    # Sort by the defined order
-    age_group_counts['age_group'] = pd.Categorical(age_group_counts['age_group'], categories=age_order, ordered=True)
-    age_group_counts = age_group_counts.sort_values('age_group')
+    # Count requests per age group, already in AGE_ORDER
+    age_group_counts = count_by('age_group', mask)
     
     # Create the figure
-    fig = px.bar(
-        age_group_counts, 
-        x='age_group', 
-        y='count',
-        labels={'count': 'Number of Requests', 'age_group': 'Age Group'},
-        color='count',
-        color_continuous_scale='Teal'
+    fig = go.Figure(
+        go.Bar(
+            x=age_group_counts.index,
+            y=age_group_counts.values,
+            marker=dict(color=age_group_counts.values, coloraxis='coloraxis'),
+            hovertemplate='Age Group=%{x}<br>Number of Requests=%{y}<extra></extra>'
+        ),
+        layout=dict(coloraxis=dict(colorscale=_TEAL))
     )
     
     fig.update_layout(
@@ -900,6 +1416,29 @@ def update_age_group_chart(continents, countries, age_groups, request_types, sta
     
     return fig
 
+# Home page charts share one callback, so a filter change is a single request and the
+# filter mask is computed once for all four figures
+@app.callback(
+    [Output('time-series-chart', 'figure'),
+    Output('request-type-pie', 'figure'),
+    Output('country-bar-chart', 'figure'),
+    Output('age-group-chart', 'figure')],
+    [Input('continent-filter', 'value'),
+    Input('country-filter', 'value'),
+    Input('age-group-filter', 'value'),
+    Input('request-type-filter', 'value'),
+    Input('date-range', 'start_date'),
+    Input('date-range', 'end_date')]
+)
+def update_home_charts(continents, countries, age_groups, request_types, start_date, end_date):
+    filters = (continents, countries, age_groups, request_types, start_date, end_date)
+    return (
+        update_time_series(*filters),
+        update_request_type_pie(*filters),
+        update_country_bar_chart(*filters),
+        update_age_group_chart(*filters)
+    )
+
 # Update statistics table callback
 @app.callback(
     Output('statistics-table', 'children'),
@@ -912,29 +1451,37 @@ def update_age_group_chart(continents, countries, age_groups, request_types, sta
 )
 @handle_error
 def update_statistics_table(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
+    
+    # Requests per (request type, hour) as a types x 24 matrix, from one np.bincount over
+    # the combined code type * 24 + hour
+    types = df['request_type'].cat.categories
+    codes = CATEGORY_CODES['request_type'][mask].astype(np.intp)
+    hours = df['hour'].values[mask]
+    valid = (codes >= 0) & (hours >= 0) & (hours < 24)
+    counts = np.bincount(codes[valid] * 24 + hours[valid].astype(np.intp),
+                         minlength=len(types) * 24).reshape(len(types), 24)
+    seen = counts.any(axis=1)
+    types, counts = types[seen], counts[seen]
+    
+    # Mean and sample std over the hours each type was seen in; a type seen in a single
+    # hour has no std (NaN)
+    active_hours = np.count_nonzero(counts, axis=1)
+    totals = counts.sum(axis=1)
+    means = totals / active_hours
+    deviations = np.where(counts > 0, counts - means[:, None], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stds = np.sqrt((deviations ** 2).sum(axis=1) / (active_hours - 1))
+    peaks = counts.argmax(axis=1)
     
-    # Calculate statistics by request type
     stats = []
-    for req_type in filtered_df['request_type'].unique():
-        req_df = filtered_df[filtered_df['request_type'] == req_type]
-        
-        # Group by hour and count requests
-        hourly_counts = req_df.groupby('hour').size().reset_index(name='count')
-        
-        # Calculate mean and standard deviation
-        mean_requests = hourly_counts['count'].mean()
-        std_requests = hourly_counts['count'].std()
-        
-        # Find peak hour
-        peak_hour = hourly_counts.loc[hourly_counts['count'].idxmax(), 'hour']
-        
+    for i, req_type in enumerate(types):
         stats.append({
             'Request Type': req_type,
-            'Total Requests': len(req_df),
-            'Mean Requests per Hour': f"{mean_requests:.2f}",
-            'Standard Deviation': f"{std_requests:.2f}",
-            'Peak Hour': f"{peak_hour}:00"
+            'Total Requests': int(totals[i]),
+            'Mean Requests per Hour': f"{means[i]:.2f}",
+            'Standard Deviation': f"{stds[i]:.2f}",
+            'Peak Hour': f"{peaks[i]}:00"
         })
     
     # Create the table
@@ -977,13 +1524,26 @@ def update_statistics_table(continents, countries, age_groups, request_types, st
 )
 def reset_filters(n_clicks):
     if n_clicks:
-        # Ensure timestamp is datetime before calling .date()
-        min_date = df['timestamp'].min().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].min()).date()
-        max_date = df['timestamp'].max().date() if pd.api.types.is_datetime64_any_dtype(df['timestamp']) else pd.to_datetime(df['timestamp'].max()).date()
-        return [], [], [], [], min_date, max_date
+        return [], [], [], [], _MIN_DATE, _MAX_DATE
     # Return the current values on initial load
     return dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update, dash.no_update
 
+# Navigation buttons and the page each one opens
+NAV_PAGES = {
+    'nav-home': 'home',
+    'nav-map': 'map',
+    'nav-time': 'time',
+    'nav-requests': 'requests',
+    'nav-data': 'data'
+}
+
+# Navigation outputs per clicked button: the page, then the class of every button with
+# the clicked one active
+_NAV_OUT = {
+    button_id: (page, *['nav-link active' if other == button_id else 'nav-link' for other in NAV_PAGES])
+    for button_id, page in NAV_PAGES.items()
+}
+
 # Navigation callbacks
 @app.callback(
     [Output('current-page', 'data'),
@@ -1002,228 +1562,175 @@ def reset_filters(n_clicks):
 def update_navigation(home_clicks, map_clicks, time_clicks, requests_clicks, data_clicks, current):
     ctx = dash.callback_context
     
-    # Default styles
-    styles = {
-        'nav-home': 'nav-link',
-        'nav-map': 'nav-link',
-        'nav-time': 'nav-link',
-        'nav-requests': 'nav-link',
-        'nav-data': 'nav-link'
-    }
-    
     if not ctx.triggered:
         # No clicks yet, set home as active
-        styles['nav-home'] = 'nav-link active'
-        return current, styles['nav-home'], styles['nav-map'], styles['nav-time'], styles['nav-requests'], styles['nav-data']
-    else:
-        # Get the id of the component that triggered the callback
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+        return (current,) + _NAV_OUT['nav-home'][1:]
+    
+    # Get the id of the component that triggered the callback
+    return _NAV_OUT[ctx.triggered[0]['prop_id'].split('.')[0]]
+
+# Page layouts are static, so they are built once at import and render_content hands
+# back the same component trees on every navigation. _HOME_LAYOUT is defined before
+# dashboard_layout, which opens on it.
+
+# Map page: choropleth with its own request type filter
+_MAP_LAYOUT = [
+    html.H2("Geographic Distribution", className='page-title'),
+    html.Div([
+        html.Div([
+            html.Div([
+                html.Label("Filter by Request Type:", style={'marginBottom': '10px', 'fontWeight': 'bold'}),
+                dcc.Dropdown(
+                    id='map-request-type-filter',
+                    options=REQUEST_TYPE_OPTIONS,
+                    value=None,
+                    placeholder='Select request type...',
+                    className='filter-dropdown'
+                )
+            ], style={'marginBottom': '20px'}),
+            
+            html.H3("Requests by Country", style={'marginTop': '20px', 'marginBottom': '10px'}),
+            dcc.Graph(
+                id='world-map-chart',
+                config={'displayModeBar': True, 'scrollZoom': True}
+            )
+        ], className='chart-container full-width')
+    ], className='charts-grid')
+]
+
+# Time page: hourly, day-of-week and monthly distributions
+_TIME_LAYOUT = [
+    html.H2("Time Analysis", className='page-title'),
+    html.Div([
+        html.Div([
+            html.H3("Hourly Distribution"),
+            dcc.Graph(
+                id='hourly-chart',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container'),
         
-        # Set the active style for the clicked button
-        styles[button_id] = 'nav-link active'
+        html.Div([
+            html.H3("Daily Distribution"),
+            dcc.Graph(
+                id='daily-chart',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container'),
         
-        # Map button_id to page name
-        page_mapping = {
-            'nav-home': 'home',
-            'nav-map': 'map',
-            'nav-time': 'time',
-            'nav-requests': 'requests',
-            'nav-data': 'data'
-        }
+        html.Div([
+            html.H3("Monthly Distribution"),
+            dcc.Graph(
+                id='monthly-chart',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container full-width')
+    ], className='charts-grid')
+]
+
+# Requests page: request type breakdowns
+_REQUESTS_LAYOUT = [
+    html.H2("Request Type Analysis", className='page-title'),
+    html.Div([
+        html.Div([
+            html.H3("Request Type Distribution"),
+            dcc.Graph(
+                id='request-type-pie-detailed',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container'),
         
-        return page_mapping[button_id], styles['nav-home'], styles['nav-map'], styles['nav-time'], styles['nav-requests'], styles['nav-data']
+        html.Div([
+            html.H3("Request Types Over Time"),
+            dcc.Graph(
+                id='request-time-series',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container'),
+        
+        html.Div([
+            html.H3("Request Types by Country"),
+            dcc.Graph(
+                id='request-country-heatmap',
+                config={'displayModeBar': False}
+            )
+        ], className='chart-container full-width')
+    ], className='charts-grid')
+]
+
+# Data page: export controls and the first rows of the data
+_DATA_LAYOUT = [
+    html.H2("Raw Data", className='page-title'),
+    html.Div([
+        html.Div([
+            html.H3("Data Table"),
+            html.Div([
+                html.Div([
+                    html.Button("Export CSV", id="export-csv", className="btn-primary", style={"marginRight": "10px"}),
+                    html.Button("Export JSON", id="export-json", className="btn-primary", style={"marginRight": "10px"}),
+                    html.Button("Export Excel", id="export-excel", className="btn-primary", style={"marginRight": "10px"}),
+                    html.Button("Export Parquet", id="export-parquet", className="btn-primary"),
+                    html.Div(id="export-message", style={"marginTop": "10px", "color": "green"}),
+                    # File of the export running in the background, polled until it is written
+                    dcc.Store(id='export-job'),
+                    dcc.Interval(id='export-poll', interval=1000, disabled=True),
+                    dcc.Download(id='export-download')
+                ], style={"marginBottom": "20px", "display": "flex", "flexWrap": "wrap", "gap": "10px"}),
+                html.Div([
+                    html.Label("Export Options:", style={"fontWeight": "bold", "marginRight": "10px"}),
+                    dcc.RadioItems(
+                        id='export-option',
+                        options=[
+                            {'label': 'Current View', 'value': 'current'},
+                            {'label': 'All Filtered Data', 'value': 'all'}
+                        ],
+                        value='current',
+                        labelStyle={'display': 'inline-block', 'marginRight': '20px'}
+                    )
+                ], style={"marginBottom": "20px"})
+            ]),
+            dash.dash_table.DataTable(
+                id='data-table',
+                columns=[{"name": i, "id": i} for i in EXPORT_COLS],
+                page_current=0,
+                page_size=20,
+                page_action="custom",
+                filter_action="custom",
+                filter_query='',
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                style_table={'overflowX': 'auto', 'height': '500px'},
+                style_cell={
+                    'height': 'auto',
+                    'minWidth': '100px', 'width': '150px', 'maxWidth': '200px',
+                    'whiteSpace': 'normal',
+                    'textAlign': 'left'
+                },
+                style_header={
+                    'backgroundColor': 'rgb(230, 230, 230)',
+                    'fontWeight': 'bold'
+                },
+                export_format="csv"
+            )
+        ], className='chart-container full-width')
+    ], className='charts-grid')
+]
+
+_PAGE_LAYOUTS = {
+    'home': _HOME_LAYOUT,
+    'map': _MAP_LAYOUT,
+    'time': _TIME_LAYOUT,
+    'requests': _REQUESTS_LAYOUT,
+    'data': _DATA_LAYOUT
+}
 
 @app.callback(
     Output('dashboard-content', 'children'),
     [Input('current-page', 'data')]
 )
 def render_content(page):
-    if page == 'home':
-        return [
-            # Key metrics
-            html.Div([
-                html.Div([
-                    html.H4('Total Requests', style={'color': 'white'}),
-                    html.H2(id='total-requests', children='10,000', style={'color': 'white'}),
-                ], className='metric-card', style={'backgroundColor': '#e74c3c'}),
-                
-                html.Div([
-                    html.H4('Demo Requests', style={'color': 'white'}),
-                    html.H2(id='demo-requests', children='2,489', style={'color': 'white'}),
-                ], className='metric-card', style={'backgroundColor': '#2ecc71'}),
-                
-                html.Div([
-                    html.H4('Job Placements', style={'color': 'white'}),
-                    html.H2(id='job-placements', children='2,441', style={'color': 'white'}),
-                ], className='metric-card', style={'backgroundColor': '#3498db'}),
-                
-                html.Div([
-                    html.H4('AI Assistant Requests', style={'color': '#2c3e50'}),
-                    html.H2(id='ai-assistant-requests', children='2,506', style={'color': '#2c3e50'}),
-                ], className='metric-card', style={'backgroundColor': '#FFA500'})
-            ], className='metrics-container'),
-            
-            # Charts
-            html.Div([
-                html.Div([
-                    html.H3('Request Volume Over Time'),
-                    dcc.Graph(id='time-series-chart', config={'displayModeBar': False})
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3('Request Type Distribution'),
-                    dcc.Graph(id='request-type-pie', config={'displayModeBar': False})
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3('Requests by Country'),
-                    dcc.Graph(id='country-bar-chart', config={'displayModeBar': False})
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3('Requests by Age Group'),
-                    dcc.Graph(id='age-group-chart', config={'displayModeBar': False})
-                ], className='chart-container'),
-            ], className='charts-grid'),
-            
-            # Statistics section
-            html.Div([
-                html.H3('Request Statistics'),
-                html.Div(id='statistics-table', className='stats-table')
-            ], className='statistics-section')
-        ]
-    elif page == 'map':
-        return [
-            html.H2("Geographic Distribution", className='page-title'),
-            html.Div([
-                html.Div([
-                    html.Div([
-                        html.Label("Filter by Request Type:", style={'marginBottom': '10px', 'fontWeight': 'bold'}),
-                        dcc.Dropdown(
-                            id='map-request-type-filter',
-                            options=[{'label': req, 'value': req} for req in sorted(df['request_type'].unique())],
-                            value=None,
-                            placeholder='Select request type...',
-                            className='filter-dropdown'
-                        )
-                    ], style={'marginBottom': '20px'}),
-                    
-                    html.H3("Requests by Country", style={'marginTop': '20px', 'marginBottom': '10px'}),
-                    dcc.Graph(
-                        id='world-map-chart',
-                        config={'displayModeBar': True, 'scrollZoom': True}
-                    )
-                ], className='chart-container full-width')
-            ], className='charts-grid')
-        ]
-    elif page == 'time':
-        return [
-            html.H2("Time Analysis", className='page-title'),
-            html.Div([
-                html.Div([
-                    html.H3("Hourly Distribution"),
-                    dcc.Graph(
-                        id='hourly-chart',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3("Daily Distribution"),
-                    dcc.Graph(
-                        id='daily-chart',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3("Monthly Distribution"),
-                    dcc.Graph(
-                        id='monthly-chart',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container full-width')
-            ], className='charts-grid')
-        ]
-    elif page == 'requests':
-        return [
-            html.H2("Request Type Analysis", className='page-title'),
-            html.Div([
-                html.Div([
-                    html.H3("Request Type Distribution"),
-                    dcc.Graph(
-                        id='request-type-pie-detailed',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3("Request Types Over Time"),
-                    dcc.Graph(
-                        id='request-time-series',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container'),
-                
-                html.Div([
-                    html.H3("Request Types by Country"),
-                    dcc.Graph(
-                        id='request-country-heatmap',
-                        config={'displayModeBar': False}
-                    )
-                ], className='chart-container full-width')
-            ], className='charts-grid')
-        ]
-    elif page == 'data':
-        return [
-            html.H2("Raw Data", className='page-title'),
-            html.Div([
-                html.Div([
-                    html.H3("Data Table"),
-                    html.Div([
-                        html.Div([
-                            html.Button("Export CSV", id="export-csv", className="btn-primary", style={"marginRight": "10px"}),
-                            html.Button("Export JSON", id="export-json", className="btn-primary", style={"marginRight": "10px"}),
-                            html.Button("Export Excel", id="export-excel", className="btn-primary"),
-                            html.Div(id="export-message", style={"marginTop": "10px", "color": "green"})
-                        ], style={"marginBottom": "20px", "display": "flex", "flexWrap": "wrap", "gap": "10px"}),
-                        html.Div([
-                            html.Label("Export Options:", style={"fontWeight": "bold", "marginRight": "10px"}),
-                            dcc.RadioItems(
-                                id='export-option',
-                                options=[
-                                    {'label': 'Current View', 'value': 'current'},
-                                    {'label': 'All Filtered Data', 'value': 'all'}
-                                ],
-                                value='current',
-                                labelStyle={'display': 'inline-block', 'marginRight': '20px'}
-                            )
-                        ], style={"marginBottom": "20px"})
-                    ]),
-                    dash.dash_table.DataTable(
-                        id='data-table',
-                        columns=[{"name": i, "id": i} for i in df.columns],
-                        data=df.head(100).to_dict('records'),
-                        page_size=20,
-                        filter_action="native",
-                        sort_action="native",
-                        sort_mode="multi",
-                        style_table={'overflowX': 'auto', 'height': '500px'},
-                        style_cell={
-                            'height': 'auto',
-                            'minWidth': '100px', 'width': '150px', 'maxWidth': '200px',
-                            'whiteSpace': 'normal',
-                            'textAlign': 'left'
-                        },
-                        style_header={
-                            'backgroundColor': 'rgb(230, 230, 230)',
-                            'fontWeight': 'bold'
-                        },
-                        export_format="csv"
-                    )
-                ], className='chart-container full-width')
-            ], className='charts-grid')
-        ]
+    return _PAGE_LAYOUTS.get(page, _HOME_LAYOUT)
 
 # Add a new callback for the map page to update the map based on filters
 # Add this after the other callbacks:
@@ -1239,28 +1746,38 @@ def render_content(page):
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_world_map(map_request_type, continents, countries, age_groups, request_types, start_date, end_date):
-    # Use the filter_dataframe function to apply all filters consistently
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    # Use the filter_mask function to apply all filters consistently
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
     # Apply the map-specific request type filter if selected
     if map_request_type:
-        filtered_df = filtered_df[filtered_df['request_type'] == map_request_type]
+        code = df['request_type'].cat.categories.get_indexer([map_request_type])[0]
+        mask = mask & (CATEGORY_CODES['request_type'] == code) if code >= 0 else np.zeros_like(mask)
     
-    # Group by country and count
-    country_counts = filtered_df.groupby('country').size().reset_index(name='count')
+    # Count requests per country
+    country_counts = count_by('country', mask)
+    
+    # Locate countries by ISO-3 code; fall back to plotly's name matching only when a
+    # country isn't in COUNTRY_ISO3
+    iso3 = country_counts.index.map(COUNTRY_ISO3)
+    by_code = not iso3.isna().any()
     
     # Create a choropleth map
-    fig = px.choropleth(
-        country_counts,
-        locations='country',
-        locationmode='country names',
-        color='count',
-        hover_name='country',
-        hover_data={'count': True},
-        color_continuous_scale='Viridis',
-        labels={'count': 'Number of Requests'},
-        title=f'Request Distribution by Country{" - " + map_request_type if map_request_type else ""}'
+    fig = go.Figure(
+        go.Choropleth(
+            locations=iso3 if by_code else country_counts.index,
+            locationmode='ISO-3' if by_code else 'country names',
+            z=country_counts.values,
+            coloraxis='coloraxis',
+            hovertext=country_counts.index,
+            hovertemplate='<b>%{hovertext}</b><br><br>Number of Requests=%{z}<extra></extra>'
+        ),
+        layout=dict(
+            coloraxis=dict(colorscale=_VIRIDIS),
+            title=f'Request Distribution by Country{" - " + map_request_type if map_request_type else ""}'
+        )
     )
     
     fig.update_layout(
@@ -1297,20 +1814,26 @@ def update_world_map(map_request_type, continents, countries, age_groups, reques
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_hourly_chart(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
-    # Group by hour and count
-    hourly_counts = filtered_df.groupby('hour').size().reset_index(name='count')
+    # Count requests per hour
+    hourly_counts = count_hours(mask)
     
     # Create the figure
-    fig = px.bar(
-        hourly_counts,
-        x='hour',
-        y='count',
-        labels={'hour': 'Hour of Day', 'count': 'Number of Requests'},
-        title='Requests by Hour of Day',
-        color_discrete_sequence=['#3498db']  # Use blue color to match screenshot
+    fig = go.Figure(
+        go.Bar(
+            x=hourly_counts.index,
+            y=hourly_counts.values,
+            marker_color='#3498db',  # Use blue color to match screenshot
+            hovertemplate='Hour of Day=%{x}<br>Number of Requests=%{y}<extra></extra>'
+        ),
+        layout=dict(
+            title='Requests by Hour of Day',
+            xaxis_title='Hour of Day',
+            yaxis_title='Number of Requests'
+        )
     )
     
     fig.update_layout(
@@ -1333,29 +1856,27 @@ def update_hourly_chart(continents, countries, age_groups, request_types, start_
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_daily_chart(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
-    
-    # Define the order of days
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
-    # Group by day and count
-    daily_counts = filtered_df['day'].value_counts().reset_index()
-    daily_counts.columns = ['day', 'count']
-    
-    # Sort by the defined order
-    daily_counts['day'] = pd.Categorical(daily_counts['day'], categories=day_order, ordered=True)
-    daily_counts = daily_counts.sort_values('day')
+    # Count requests per day of week, in week order
+    daily_counts = count_days(mask)
     
     # Create the figure
-    fig = px.bar(
-        daily_counts,
-        x='day',
-        y='count',
-        labels={'day': 'Day of Week', 'count': 'Number of Requests'},
-        title='Requests by Day of Week',
-        color='count',
-        color_continuous_scale='Teal'
+    fig = go.Figure(
+        go.Bar(
+            x=daily_counts.index,
+            y=daily_counts.values,
+            marker=dict(color=daily_counts.values, coloraxis='coloraxis'),
+            hovertemplate='Day of Week=%{x}<br>Number of Requests=%{y}<extra></extra>'
+        ),
+        layout=dict(
+            title='Requests by Day of Week',
+            xaxis_title='Day of Week',
+            yaxis_title='Number of Requests',
+            coloraxis=dict(colorscale=_TEAL)
+        )
     )
     
     fig.update_layout(
@@ -1378,29 +1899,26 @@ def update_daily_chart(continents, countries, age_groups, request_types, start_d
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_monthly_chart(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, request_types, start_date, end_date)
     
-    # Define the order of months
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June', 
-                'July', 'August', 'September', 'October', 'November', 'December']
-    
-    # Group by month and count
-    monthly_counts = filtered_df['month'].value_counts().reset_index()
-    monthly_counts.columns = ['month', 'count']
-    
-    # Sort by the defined order
-    monthly_counts['month'] = pd.Categorical(monthly_counts['month'], categories=month_order, ordered=True)
-    monthly_counts = monthly_counts.sort_values('month')
+    # Count requests per month, in calendar order
+    monthly_counts = count_months(mask)
     
     # Create the figure
-    fig = px.line(
-        monthly_counts,
-        x='month',
-        y='count',
-        labels={'month': 'Month', 'count': 'Number of Requests'},
-        title='Requests by Month',
-        markers=True
+    fig = go.Figure(
+        go.Scatter(
+            x=monthly_counts.index,
+            y=monthly_counts.values,
+            mode='lines+markers',
+            hovertemplate='Month=%{x}<br>Number of Requests=%{y}<extra></extra>'
+        ),
+        layout=dict(
+            title='Requests by Month',
+            xaxis_title='Month',
+            yaxis_title='Number of Requests'
+        )
     )
     
     fig.update_layout(
@@ -1422,21 +1940,23 @@ def update_monthly_chart(continents, countries, age_groups, request_types, start
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_request_type_pie_detailed(continents, countries, age_groups, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, [], start_date, end_date)
+    mask = filter_mask(df, continents, countries, age_groups, [], start_date, end_date)
     
-    # Group by request type and count
-    request_type_counts = filtered_df['request_type'].value_counts().reset_index()
-    request_type_counts.columns = ['request_type', 'count']
+    # Count requests per request type
+    request_type_counts = count_by('request_type', mask)
     
     # Create the figure
-    fig = px.pie(
-        request_type_counts, 
-        values='count', 
-        names='request_type',
-        hole=0.4,
-        color_discrete_sequence=px.colors.qualitative.Set3,
-        title='Request Type Distribution'
+    fig = go.Figure(
+        go.Pie(
+            labels=request_type_counts.index,
+            values=request_type_counts.values,
+            hole=0.4,
+            marker=dict(colors=_SET3),
+            hovertemplate='request_type=%{label}<br>count=%{value}<extra></extra>'
+        ),
+        layout=dict(title='Request Type Distribution')
     )
     
     fig.update_layout(
@@ -1460,21 +1980,32 @@ def update_request_type_pie_detailed(continents, countries, age_groups, start_da
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_request_time_series(continents, countries, age_groups, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, [], start_date, end_date)
-    
-    # Group by date and request type
-    request_time = filtered_df.groupby([filtered_df['timestamp'].dt.date, 'request_type']).size().reset_index(name='count')
-    
-    # Create the figure
-    fig = px.line(
-        request_time,
-        x='timestamp',
-        y='count',
-        color='request_type',
-        title='Request Types Over Time',
-        labels={'timestamp': 'Date', 'count': 'Number of Requests', 'request_type': 'Request Type'}
-    )
+    mask = filter_mask(df, continents, countries, age_groups, [], start_date, end_date)
+    
+    # Requests per (request type, day) as a types x days matrix, from one np.bincount over
+    # the combined code type * N_DAYS + day offset
+    types = df['request_type'].cat.categories
+    codes = CATEGORY_CODES['request_type'][mask].astype(np.intp)
+    offsets = DAY_OFFSETS[mask]
+    valid = (codes >= 0) & (offsets >= 0)
+    counts = np.bincount(codes[valid] * N_DAYS + offsets[valid],
+                         minlength=len(types) * N_DAYS).reshape(len(types), N_DAYS)
+    
+    # Create the figure, one line per request type over the days it has requests
+    traces = []
+    for i, req_type in enumerate(types):
+        days = np.flatnonzero(counts[i])
+        if len(days):
+            traces.append(go.Scatter(
+                x=FIRST_DAY + days,
+                y=counts[i, days],
+                mode='lines',
+                name=req_type,
+                hovertemplate=f'Request Type={req_type}<br>Date=%{{x}}<br>Number of Requests=%{{y}}<extra></extra>'
+            ))
+    fig = go.Figure(traces, layout=dict(title='Request Types Over Time', legend_title_text='Request Type'))
     
     fig.update_layout(
         margin=dict(l=20, r=20, t=50, b=20),
@@ -1505,25 +2036,52 @@ def update_request_time_series(continents, countries, age_groups, start_date, en
     Input('date-range', 'end_date')]
 )
 @handle_error
+@cache_figure
 def update_request_country_heatmap(continents, countries, age_groups, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, [], start_date, end_date)
-    
-    # Group by country and request type
-    country_request = filtered_df.groupby(['country', 'request_type']).size().reset_index(name='count')
-    
-    # Pivot the data for the heatmap
-    heatmap_data = country_request.pivot(index='country', columns='request_type', values='count').fillna(0)
-    
-    # Take top 10 countries by total requests
-    top_countries = filtered_df['country'].value_counts().nlargest(10).index.tolist()
-    heatmap_data = heatmap_data.loc[heatmap_data.index.isin(top_countries)]
-    
-    # Create the figure
-    fig = px.imshow(
-        heatmap_data,
-        labels=dict(x='Request Type', y='Country', color='Number of Requests'),
-        title='Request Types by Country (Top 10 Countries)',
-        color_continuous_scale='Viridis'
+    country_names = df['country'].cat.categories
+    type_names = df['request_type'].cat.categories
+    
+    # Requests per (country, request type) as a countries x types matrix
+    if not continents and not age_groups:
+        # Sum the precomputed cube over the selected days
+        lo = day_offset(start_date) if start_date else 0
+        hi = day_offset(end_date) + 1 if end_date else N_DAYS
+        matrix = COUNTRY_REQUEST_CUBE[max(lo, 0):max(hi, 0)].sum(axis=0)
+        if not start_date and not end_date:
+            matrix = matrix + UNDATED_COUNTRY_REQUESTS
+        if countries:
+            codes = country_names.get_indexer(list(countries))
+            selected = np.zeros(len(country_names), dtype=bool)
+            selected[codes[codes >= 0]] = True
+            matrix = np.where(selected[:, None], matrix, 0)
+    else:
+        mask = filter_mask(df, continents, countries, age_groups, [], start_date, end_date)
+        cells = COUNTRY_REQUEST_CELLS[mask]
+        matrix = np.bincount(cells[cells >= 0], minlength=N_COUNTRIES * N_REQUEST_TYPES)
+        matrix = matrix.reshape(N_COUNTRIES, N_REQUEST_TYPES)
+    
+    # Top 10 countries by total requests (in category order) against the request types
+    # that occur at all
+    totals = matrix.sum(axis=1)
+    top = np.sort(np.argsort(-totals, kind='stable')[:10])
+    top = top[totals[top] > 0]
+    present_types = np.flatnonzero(matrix.sum(axis=0))
+    
+    # Create the figure, first country at the top
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix[np.ix_(top, present_types)],
+            x=type_names[present_types],
+            y=country_names[top],
+            coloraxis='coloraxis',
+            hovertemplate='Request Type=%{x}<br>Country=%{y}<br>Number of Requests=%{z}<extra></extra>'
+        ),
+        layout=dict(
+            title='Request Types by Country (Top 10 Countries)',
+            xaxis_title='Request Type',
+            yaxis=dict(title='Country', autorange='reversed'),
+            coloraxis=dict(colorscale=_VIRIDIS, colorbar_title_text='Number of Requests')
+        )
     )
     
     fig.update_layout(
@@ -1535,9 +2093,104 @@ def update_request_country_heatmap(continents, countries, age_groups, start_date
     
     return fig
 
-# Add callback for the data table
+# Operators of the data table's filter query, longest first within each group so that
+# 'ge' isn't read as 'gt'. Each group lists the keyword and its symbol form.
+TABLE_FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'],
+                          ['ne ', '!='], ['eq ', '='], ['contains '], ['datestartswith ']]
+
+# Split one '{column} op value' part of a filter query into (column, operator, value)
+def split_filter_part(filter_part):
+    for operator_type in TABLE_FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1:name_part.rfind('}')]
+                value_part = value_part.strip()
+                quote = value_part[:1]
+                if quote in ("'", '"', '`') and value_part.endswith(quote) and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+# Rows of column whose text passes test, a function of a .str accessor. On a categorical
+# column the test runs once per category and rows are matched through their codes, and
+# string columns are tested as they are, instead of converting every row to a string.
+# Missing strings never match.
+def match_text(column, test):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        labels = pd.Series(column.cat.categories.astype(str))
+        selected = np.append(test(labels.str).to_numpy(dtype=bool), False)
+        return selected[column.cat.codes.values]
+    if not isinstance(column.dtype, pd.StringDtype):
+        column = column.astype(str)
+    return test(column.str).to_numpy(dtype=bool, na_value=False)
+
+# Rows shown by the data table, as positions in df: the filtered rows narrowed by the
+# table's own filter query and ordered by its sort_by. Each step reads only the columns
+# it tests or sorts on, and no frame is built until a page is taken from the positions.
+# Cached, so paging through a view only gathers the rows of the page.
+@functools.lru_cache(maxsize=8)
+def _table_view_cached(filter_key, filter_query, sort_by):
+    positions = np.arange(len(df))[filtered_rows(df, *filter_key[1:])]
+    for part in filter_query.split(' && ') if filter_query else ():
+        column, operator, value = split_filter_part(part)
+        if column not in EXPORT_COLS:
+            continue
+        values = df[column].take(positions)
+        try:
+            if operator == 'contains':
+                keep = match_text(values, lambda text: text.contains(str(value), regex=False))
+            elif operator == 'datestartswith':
+                keep = match_text(values, lambda text: text.startswith(str(value)))
+            else:
+                keep = getattr(values, operator)(value).to_numpy(dtype=bool, na_value=False)
+            positions = positions[keep]
+        except (TypeError, ValueError) as e:
+            print(f"Ignoring data table filter {part!r}: {e}")
+    if sort_by:
+        columns = [column for column, _ in sort_by]
+        order = df[columns].take(positions).reset_index(drop=True).sort_values(
+            columns,
+            ascending=[direction == 'asc' for _, direction in sort_by],
+            kind='mergesort'
+        ).index
+        positions = positions[order]
+    
+    # Cached and shared between callbacks, so make sure nobody modifies it in place
+    positions.setflags(write=False)
+    return positions
+
+# Positions in df of the data table's rows for the dashboard filters and the table's own
+# sort_by and filter_query
+def table_view(continents, countries, age_groups, request_types, start_date, end_date,
+               sort_by, filter_query):
+    if filter_query or sort_by:
+        return _table_view_cached(
+            _filter_key(df, continents, countries, age_groups, request_types, start_date, end_date),
+            filter_query or '',
+            tuple((s['column_id'], s['direction']) for s in sort_by or ())
+        )
+    # Without the table's own filter or sort, the view is just the filtered rows
+    rows = filtered_rows(df, continents, countries, age_groups, request_types, start_date, end_date)
+    return range(len(df))[rows] if isinstance(rows, slice) else rows
+
+# Data table records for the rows of df at positions, built column by column: one tolist
+# per column zipped into dicts, instead of to_dict boxing each cell of each row in turn
+def table_records(positions):
+    columns = [df[column].take(positions).tolist() for column in EXPORT_COLS]
+    return [dict(zip(EXPORT_COLS, row)) for row in zip(*columns)]
+
+# The data table and the exports work on the same filtered rows, so they are filtered
+# once per filter change here rather than by each of them. The store only carries the
+# filter selection to the browser; the row positions stay in the server's row cache,
+# which this fills before the table and the exports read it.
 @app.callback(
-    Output('data-table', 'data'),
+    Output('filtered-cache', 'data'),
     [Input('continent-filter', 'value'),
     Input('country-filter', 'value'),
     Input('age-group-filter', 'value'),
@@ -1545,65 +2198,235 @@ def update_request_country_heatmap(continents, countries, age_groups, start_date
     Input('date-range', 'start_date'),
     Input('date-range', 'end_date')]
 )
-def update_data_table(continents, countries, age_groups, request_types, start_date, end_date):
-    filtered_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
-    return filtered_df.head(100).to_dict('records')
+def update_filtered_cache(continents, countries, age_groups, request_types, start_date, end_date):
+    filters = {
+        'continents': sorted(continents or []),
+        'countries': sorted(countries or []),
+        'age_groups': sorted(age_groups or []),
+        'request_types': sorted(request_types or []),
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    filtered_rows(df, **filters)
+    return filters
+
+# Add callback for the data table. Paging, sorting and the column filters run here, so
+# only the rows of the current page are sent to the browser.
+@app.callback(
+    [Output('data-table', 'data'),
+    Output('data-table', 'page_count'),
+    Output('data-table', 'page_current')],
+    [Input('filtered-cache', 'data'),
+    Input('data-table', 'page_current'),
+    Input('data-table', 'page_size'),
+    Input('data-table', 'sort_by'),
+    Input('data-table', 'filter_query')]
+)
+def update_data_table(filters, page_current, page_size, sort_by, filter_query):
+    if filters is None:
+        return dash.no_update, dash.no_update, dash.no_update
+    view = table_view(**filters, sort_by=sort_by, filter_query=filter_query)
+    
+    # Stay within the pages of the current view, e.g. after a filter shrinks it, and
+    # gather only the rows on the page from df
+    page_size = page_size or 20
+    page_count = max(1, -(-len(view) // page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    start = page_current * page_size
+    return table_records(view[start:start + page_size]), page_count, page_current
+
+# Rows serialized at a time when writing an export, so the full file contents are never
+# built in memory at once
+EXPORT_CHUNK_ROWS = 50_000
+
+# Write export_df as CSV through Arrow's writer, which formats whole columns in C rather
+# than one cell at a time, a batch of EXPORT_CHUNK_ROWS rows at a time. Arrow writes
+# nanosecond timestamps with nine fractional digits, so whole-second timestamp columns
+# are cast to seconds first to come out as 2024-01-01 00:01:56, like to_csv wrote them.
+def write_csv_export(export_df, path):
+    table = pa.Table.from_pandas(export_df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            try:
+                table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp('s', field.type.tz)))
+            except pa.ArrowInvalid:
+                pass  # Sub-second values: keep the full precision
+    pacsv.write_csv(table, path, pacsv.WriteOptions(batch_size=EXPORT_CHUNK_ROWS))
+
+# Write export_df as a JSON array of records, one chunk of records at a time
+def write_json_export(export_df, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for start in range(0, len(export_df), EXPORT_CHUNK_ROWS):
+            records = export_df.iloc[start:start + EXPORT_CHUNK_ROWS].to_json(orient='records')
+            if start:
+                f.write(',')
+            f.write(records[1:-1])
+        f.write(']')
+
+# Write a header and rows as an Excel sheet through openpyxl's write-only mode, which
+# streams rows to the file instead of keeping a cell object per value
+def write_excel_rows(header, rows, path):
+    # Only needed for Excel exports, so a missing openpyxl doesn't stop the dashboard
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+# Rows of export_df as plain Python values, built one chunk at a time from one list per
+# column; missing values become empty cells as they did with to_excel
+def _export_rows(export_df):
+    for start in range(0, len(export_df), EXPORT_CHUNK_ROWS):
+        chunk = export_df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        yield from zip(*[chunk[c].astype(object).where(chunk[c].notna(), None).tolist()
+                         for c in chunk.columns])
+
+# Write export_df as an Excel sheet
+def write_excel_export(export_df, path):
+    write_excel_rows([str(c) for c in export_df.columns], _export_rows(export_df), path)
+
+# Write export_df as Parquet: columnar and compressed, with the categorical columns
+# dictionary-encoded, in row groups of EXPORT_CHUNK_ROWS rows
+def write_parquet_export(export_df, path):
+    export_df.to_parquet(path, engine='pyarrow', compression='zstd', index=False,
+                         row_group_size=EXPORT_CHUNK_ROWS)
+
+# Exports are written on background threads, so a large export doesn't hold up the
+# callback (and the worker serving it) until the file is done. EXPORT_JOBS maps each
+# export's file name to its format name, file path, future, submit time and owner until
+# the poll callback reports it.
+EXPORT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+EXPORT_JOBS = {}
+
+# Export files are kept in a private temporary directory, not the server's working
+# directory. A file is removed as soon as the poll callback has sent it to the browser;
+# exports nobody polled for, e.g. when another export was started or the page was left
+# before the first one finished, are removed once they are EXPORT_MAX_AGE seconds old.
+# The directory goes when the server exits.
+EXPORT_DIR = tempfile.mkdtemp(prefix='dashboard_exports_')
+EXPORT_MAX_AGE = 30 * 60
+atexit.register(shutil.rmtree, EXPORT_DIR, ignore_errors=True)
+
+# Remove expired export files and forget expired jobs that have finished
+def cleanup_exports():
+    expired = time.time() - EXPORT_MAX_AGE
+    for filename, (_, _, job, submitted, _) in list(EXPORT_JOBS.items()):
+        if submitted < expired and job.done():
+            EXPORT_JOBS.pop(filename, None)
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.stat().st_mtime < expired and entry.name not in EXPORT_JOBS:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"Error removing expired export {entry.name}: {e}")
+
+# Export file names are the server's start time plus a random token, so they stay unique
+# without formatting the time on every export, and can't be guessed from one another
+EXPORT_SESSION = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# Random id of the browser session that started an export, kept in Flask's signed
+# session cookie. A job is only reported to the session that owns it.
+def export_owner():
+    if 'export_owner' not in session:
+        session['export_owner'] = secrets.token_urlsafe(16)
+    return session['export_owner']
+
+# Writer, file extension and format name of each export button
+EXPORT_FORMATS = {
+    'export-csv': (write_csv_export, 'csv', 'CSV'),
+    'export-json': (write_json_export, 'json', 'JSON'),
+    'export-excel': (write_excel_export, 'xlsx', 'Excel'),
+    'export-parquet': (write_parquet_export, 'parquet', 'Parquet')
+}
 
 # Add download callbacks for different formats
 @app.callback(
-    Output('export-message', 'children'),
+    [Output('export-message', 'children'),
+    Output('export-job', 'data'),
+    Output('export-poll', 'disabled')],
     [Input('export-csv', 'n_clicks'),
     Input('export-json', 'n_clicks'),
-    Input('export-excel', 'n_clicks')],
+    Input('export-excel', 'n_clicks'),
+    Input('export-parquet', 'n_clicks')],
     [State('export-option', 'value'),
-    State('continent-filter', 'value'),
-    State('country-filter', 'value'),
-    State('age-group-filter', 'value'),
-    State('request-type-filter', 'value'),
-    State('date-range', 'start_date'),
-    State('date-range', 'end_date'),
-    State('data-table', 'derived_virtual_data')],
+    State('filtered-cache', 'data'),
+    State('data-table', 'sort_by'),
+    State('data-table', 'filter_query')],
     prevent_initial_call=True
 )
-def export_data(csv_clicks, json_clicks, excel_clicks, export_option, 
-            continents, countries, age_groups, request_types, start_date, end_date,
-            table_data):
+def export_data(csv_clicks, json_clicks, excel_clicks, parquet_clicks, export_option,
+            filters, sort_by, filter_query):
     ctx = dash.callback_context
     if not ctx.triggered:
-        return ""
+        return "", dash.no_update, dash.no_update
     
     button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+    if button_id not in EXPORT_FORMATS or filters is None:
+        return "", dash.no_update, dash.no_update
+    
+    # Only the columns the table shows are gathered and written
+    columns = df[EXPORT_COLS]
     
     # Get the appropriate data based on the export option
     if export_option == 'current':
-        # Use the current table view (with any applied filters)
-        if table_data is None:
-            return "No data to export"
-        export_df = pd.DataFrame(table_data)
+        # Use the current table view (with any applied filters), every page of it. The
+        # table pages on the server, so the browser only holds the page on screen; the
+        # rows come from df with their column types rather than from that page's JSON.
+        export_df = columns.take(table_view(**filters, sort_by=sort_by, filter_query=filter_query))
     else:
         # Use all filtered data
-        export_df = filter_dataframe(df, continents, countries, age_groups, request_types, start_date, end_date)
+        rows = filtered_rows(df, **filters)
+        export_df = columns.iloc[rows] if isinstance(rows, slice) else columns.take(rows)
+    
+    cleanup_exports()
     
-    # Create a timestamp for the filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Create a unique suffix for the filename
+    timestamp = f"{EXPORT_SESSION}_{secrets.token_urlsafe(12)}"
     
+    write, extension, name = EXPORT_FORMATS[button_id]
+    filename = f'dashboard_export_{timestamp}.{extension}'
+    path = os.path.join(EXPORT_DIR, filename)
+    job = EXPORT_EXECUTOR.submit(write, export_df, path)
+    EXPORT_JOBS[filename] = (name, path, job, time.time(), export_owner())
+    return f"Exporting data to {name}: {filename}...", filename, False
+
+# Once the background export is written, send it to the browser, remove it from disk and
+# stop polling. Nothing is served from EXPORT_DIR outside this callback.
+@app.callback(
+    [Output('export-message', 'children', allow_duplicate=True),
+    Output('export-poll', 'disabled', allow_duplicate=True),
+    Output('export-download', 'data')],
+    [Input('export-poll', 'n_intervals')],
+    [State('export-job', 'data')],
+    prevent_initial_call=True
+)
+def poll_export(n_intervals, filename):
+    cleanup_exports()
+    # Jobs only exist in the process that started them; with several server workers the
+    # poll may reach another one, so say so instead of dropping the export silently. Jobs
+    # of other sessions are treated the same way.
+    if filename not in EXPORT_JOBS or EXPORT_JOBS[filename][4] != export_owner():
+        if not filename:
+            return dash.no_update, True, dash.no_update
+        return f"Error exporting data: export {filename} was not found on this server, please export again", True, dash.no_update
+    name, path, job, _, _ = EXPORT_JOBS[filename]
+    if not job.done():
+        return dash.no_update, dash.no_update, dash.no_update
+    
+    EXPORT_JOBS.pop(filename, None)
     try:
-        if button_id == 'export-csv':
-            export_df.to_csv(f'dashboard_export_{timestamp}.csv', index=False)
-            return f"Data exported to CSV successfully: dashboard_export_{timestamp}.csv"
-        
-        elif button_id == 'export-json':
-            export_df.to_json(f'dashboard_export_{timestamp}.json', orient='records')
-            return f"Data exported to JSON successfully: dashboard_export_{timestamp}.json"
-        
-        elif button_id == 'export-excel':
-            export_df.to_excel(f'dashboard_export_{timestamp}.xlsx', index=False)
-            return f"Data exported to Excel successfully: dashboard_export_{timestamp}.xlsx"
-        
+        job.result()
+        download = dcc.send_file(path, filename=filename)
+        return f"Data exported to {name} successfully: {filename}", True, download
     except Exception as e:
-        return f"Error exporting data: {str(e)}"
-    
-    return ""
+        return f"Error exporting data: {str(e)}", True, dash.no_update
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
 
 # Run the app
 if __name__ == '__main__':